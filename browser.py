@@ -4,13 +4,262 @@ Browser automation for ADP Resume Downloader
 """
 
 import asyncio
+import re
+from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import List, Optional
-from playwright.async_api import async_playwright, Page, Browser
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+from playwright.async_api import (
+    async_playwright, Page, Browser, ElementHandle,
+    Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+)
 
 from config import CONFIG, LOGGER
 from models import BrowserState, LoginStatus, CandidateModel
 
+# Selector lists, most specific first
+USER_ID_SELECTORS = (
+    'sdf-input#login-form_username',  # Exact match from HTML
+    'sdf-input[id="login-form_username"]',  # Alternative syntax
+    'sdf-input[label="User ID"]',  # Match by label
+    'sdf-input',  # Any sdf-input element
+    '#login-form_username',  # By ID
+    'input[type="text"]',  # Fallback to regular input
+    'input[autocomplete="username"]',  # Match by autocomplete
+    'input',  # Last resort
+)
+
+NEXT_BUTTON_SELECTORS = (
+    'sdf-button:has-text("Next")',  # ADP custom button component
+    'sdf-button[type="submit"]',  # ADP submit button
+    'button:text("Next")',  # Exact text match for Playwright
+    'button:has-text("Next")',  # Contains text
+    'input[value="Next"]',
+    'button[type="submit"]',
+    'sdf-button',  # Any ADP button as fallback
+    'button',  # Try any button as fallback
+    '.next-button',
+    '#nextButton'
+)
+
+PASSWORD_SELECTORS = (
+    'input[name="PASSWORD"]',
+    'input[name="password"]',
+    'input[type="password"]',
+    'input[id="PASSWORD"]',
+    'input[id="password"]',
+    '#passwordInput'
+)
+
+SUBMIT_SELECTORS = (
+    'button[type="submit"]',
+    'input[type="submit"]',
+    'button:has-text("Sign In")',
+    'button:has-text("Login")',
+    'button:has-text("Submit")',
+    '.submit-button',
+    '#submitButton'
+)
+
+NAVIGATION_SELECTORS = (
+    'a[href*="candidate"]',
+    'a[href*="resume"]',
+    'a[href*="talent"]',
+    'a[href*="recruit"]',
+    '.menu-item:has-text("Candidates")',
+    '.nav-link:has-text("Resumes")'
+)
+
+CANDIDATE_TAB_SELECTORS = (
+    'button:has-text("Candidates")',
+    'a:has-text("Candidates")',
+    '[role="tab"]:has-text("Candidates")',
+    '[data-automation-id="tab-candidates"]',
+    '.tab:has-text("Candidates")',
+)
+
+CANDIDATE_SELECTORS = (
+    '.candidate-item',
+    '.employee-row',
+    '.person-card',
+    'tr[data-candidate-id]',
+    '[data-employee-id]'
+)
+
+PAGINATION_NEXT_SELECTORS = (
+    'a:has-text("Next")',
+    'button:has-text("Next")',
+    '.pagination-next',
+    '[aria-label="Next page"]'
+)
+
+# Selector lists queried as a single comma-joined selector (one DOM pass, one round-trip)
+CANDIDATE_COMBINED = ", ".join(CANDIDATE_SELECTORS)
+PAGINATION_NEXT_COMBINED = ", ".join(PAGINATION_NEXT_SELECTORS)
+
+# Name (first line of the row text, max 50 chars) and profile link for every candidate row.
+# The union selector also matches rows nested inside another match (e.g. [data-employee-id]
+# inside .employee-row), so only the outermost match of each nest is kept
+CANDIDATE_ROWS_SCRIPT = '''
+els => {
+    const matched = new Set(els);
+    const nested = el => {
+        for (let parent = el.parentElement; parent; parent = parent.parentElement) {
+            if (matched.has(parent)) {
+                return true;
+            }
+        }
+        return false;
+    };
+    return els.filter(el => !nested(el)).map(el => {
+        const link = el.querySelector('a');
+        return {
+            name: (el.textContent || '').trim().split('\\n')[0].slice(0, 50),
+            href: link && link.getAttribute('href')
+        };
+    });
+}
+'''
+
+# Indicators for _is_logged_in; login checks are case-sensitive, success checks are not
+LOGIN_URL_INDICATORS = ['signin.adp.com', 'online.adp.com/signin', '/login', '/signin', 'User ID']
+LOGIN_CONTENT_INDICATORS = ['Password', 'Sign In']
+SUCCESS_INDICATORS = ['dashboard', 'workforce', 'home', 'employee', 'menu', 'navigation', 'logout', 'sign out']
+
+CANDIDATE_PAGE_INDICATORS = ['candidate', 'resume', 'employee', 'talent']
+
+def _alternation(indicators) -> str:
+    # Only works because re.escape output for these literals (escaped '.', '/' and space) happens
+    # to be valid JavaScript RegExp source when no 'u' flag is used; check new indicators against that
+    return "|".join(map(re.escape, indicators))
+
+# Each indicator list as one alternation source string, built once here and turned into a
+# RegExp in the page: one regex pass per haystack instead of one substring scan per indicator,
+# and no lowercased copy of the page for case-insensitive checks
+LOGIN_URL_PATTERN = _alternation(LOGIN_URL_INDICATORS)
+LOGIN_CONTENT_PATTERN = _alternation(LOGIN_CONTENT_INDICATORS)
+SUCCESS_PATTERN = _alternation(SUCCESS_INDICATORS)
+CANDIDATE_PAGE_PATTERN = _alternation(CANDIDATE_PAGE_INDICATORS)
+
+# Reports the current URL and the first indicator match for each URL/content check, in the
+# order _is_logged_in consults them; later checks are left null once one decides the result,
+# so the DOM is only serialized when a URL check cannot settle it
+LOGIN_STATE_SCRIPT = '''
+({ login_url, login_content, success }) => {
+    const url = location.href;
+    let html = null;
+    const page = () => html ??= document.documentElement.outerHTML;
+    const first = (pattern, flags, haystack) => {
+        const match = haystack.match(new RegExp(pattern, flags));
+        return match ? match[0] : null;
+    };
+    const state = { url, login_url: null, login_content: null, success_url: null, success_content: null };
+    if ((state.login_url = first(login_url, '', url))) return state;
+    if ((state.login_content = first(login_content, '', page()))) return state;
+    if ((state.success_url = first(success, 'i', url))) return state;
+    state.success_content = first(success, 'i', page());
+    return state;
+}
+'''
+
+# Case-insensitive indicator search over the serialized DOM, run in-page
+FIND_INDICATOR_SCRIPT = '''
+pattern => new RegExp(pattern, 'i').test(document.documentElement.outerHTML)
+'''
+
+def _visible_union(selectors) -> str:
+    return ", ".join(f"{selector}:visible" for selector in selectors)
+
+# Combined ':visible' selectors for _first_visible, built once at import
+USER_ID_VISIBLE = _visible_union(USER_ID_SELECTORS)
+PASSWORD_VISIBLE = _visible_union(PASSWORD_SELECTORS)
+SUBMIT_VISIBLE = _visible_union(SUBMIT_SELECTORS)
+
+# Chromium switch that stops images loading and rendering at the engine level
+NO_IMAGES_ARG = '--blink-settings=imagesEnabled=false'
+
+# True once the row captured before a click is detached or shows different text
+ROWS_CHANGED_SCRIPT = '([row, text]) => !row.isConnected || row.innerText !== text'
+
+# Cookies that only exist once ADP has issued an authenticated session
+SESSION_COOKIE_NAMES = {'SMSESSION', 'ADP_SESSION'}
+
+# Requests aborted by the resource blocker; stylesheets are kept because visibility checks depend on them
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media'}
+BLOCKED_HOSTS = ('doubleclick', 'googletagmanager', 'google-analytics', 'segment.io', 'hotjar', 'newrelic')
+# Route filter: only static assets and analytics hosts are intercepted, every other request goes
+# straight to the network without a round-trip through the handler
+BLOCKED_ROUTE_PATTERN = re.compile(
+    r'\.(?:png|jpe?g|gif|webp|svg|ico|bmp|woff2?|ttf|otf|eot|mp4|webm|mp3|ogg|wav)(?:[?#]|$)'
+    r'|' + '|'.join(re.escape(host) for host in BLOCKED_HOSTS),
+    re.IGNORECASE
+)
+
+# Login helpers installed once per context so attempt_login only sends short call expressions
+ADP_HELPERS_SCRIPT = '''
+window.__adpHelpers = {
+    // Describe how an sdf-input exposes its editable input
+    detectInput: el => {
+        if (el.shadowRoot && el.shadowRoot.querySelector('input')) {
+            return 'shadow';
+        }
+        if (el.querySelector('input')) {
+            return 'child';
+        }
+        if (el.hasAttribute('value') || el.value !== undefined) {
+            return 'direct';
+        }
+        return 'unknown';
+    },
+    // Set the value on the child input (or the host itself) and fire an input event
+    setValue: (el, value) => {
+        const target = el.querySelector('input') || el;
+        target.value = value;
+        target.dispatchEvent(new Event('input', { bubbles: true, cancelable: true }));
+    },
+    // Set the value on the host and shadow input, then fire the full validation event chain
+    setAndFireAll: (el, input, value, events) => {
+        if (input) {
+            input.focus();
+            input.value = value;
+        }
+        if (el.value !== undefined) {
+            el.value = value;
+        }
+        events.forEach(eventType => {
+            el.dispatchEvent(new Event(eventType, { bubbles: true, cancelable: true }));
+            if (input) {
+                input.dispatchEvent(new Event(eventType, { bubbles: true, cancelable: true }));
+            }
+        });
+        if (input) {
+            input.dispatchEvent(new KeyboardEvent('keydown', { key: 'Tab', bubbles: true }));
+            input.dispatchEvent(new KeyboardEvent('keyup', { key: 'Tab', bubbles: true }));
+        }
+        // Custom events that ADP might be listening for
+        el.dispatchEvent(new CustomEvent('validate', { bubbles: true, detail: { value } }));
+        el.dispatchEvent(new CustomEvent('valueChanged', { bubbles: true, detail: { value } }));
+    },
+    // Re-apply the value and nudge form validation (focus/blur, form change, Tab, custom events)
+    revalidate: (el, input, value) => {
+        el.focus();
+        if (input) {
+            input.value = value;
+            input.focus();
+            input.blur();
+        }
+        const form = el.closest('form');
+        if (form) {
+            form.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+        el.dispatchEvent(new KeyboardEvent('keydown', { key: 'Tab', keyCode: 9, bubbles: true }));
+        el.dispatchEvent(new KeyboardEvent('keyup', { key: 'Tab', keyCode: 9, bubbles: true }));
+        el.dispatchEvent(new CustomEvent('validation', { bubbles: true }));
+        el.dispatchEvent(new CustomEvent('fieldValidation', { bubbles: true }));
+    }
+};
+'''
+
 class BrowserManager:
     async def navigate_to_recruitment_page(self):
         """
@@ -29,14 +278,7 @@ class BrowserManager:
         """
         try:
             LOGGER.info("Selecting Candidates tab if not already selected")
-            tab_selectors = [
-                'button:has-text("Candidates")',
-                'a:has-text("Candidates")',
-                '[role="tab"]:has-text("Candidates")',
-                '[data-automation-id="tab-candidates"]',
-                '.tab:has-text("Candidates")',
-            ]
-            for selector in tab_selectors:
+            for selector in CANDIDATE_TAB_SELECTORS:
                 try:
                     tab = await self.page.wait_for_selector(selector, timeout=1000)
                     if tab:
@@ -120,24 +362,83 @@ class BrowserManager:
     async def _debug_form_state(self):
         # No-op debug method to prevent AttributeError
         pass
+    async def _debug_screenshot(self, name: str) -> None:
+        """
+        Saves a viewport JPEG screenshot when debug mode is enabled.
+        """
+        if not CONFIG.debug:
+            return
+        path = f"{name}.jpg"
+        await self.page.screenshot(path=path, type="jpeg", quality=60, full_page=False)
+        LOGGER.info(f"Screenshot saved: {path}")
+    async def _block_non_essential(self, route) -> None:
+        """
+        Aborts images, fonts, media and analytics requests that automation never needs.
+        """
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+            await route.abort()
+        else:
+            await route.continue_()
     def __init__(self):
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.page: Optional[Page] = None
         self.context = None
+        self._owns_browser = True
+        self._wait_for_network_idle = CONFIG.extraction.wait_for_network_idle
+        # Idle pages for concurrent candidate navigation; they share the logged-in context's cookies.
+        # Capped at the download concurrency so the pool never holds more pages than can be in use
+        self._page_pool: asyncio.Queue = asyncio.Queue(maxsize=max(1, CONFIG.download.max_concurrent))
 
     async def setup_browser(self) -> BrowserState:
         try:
             LOGGER.info("Setting up browser")
             self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=CONFIG.browser.headless
-            )
-            self.context = await self.browser.new_context()
-            self.page = await self.context.new_page()
+            # Blocked images never arrive anyway; this also skips image decode and layout for them
+            launch_args = [NO_IMAGES_ARG] if CONFIG.browser.block_resources else []
+            if CONFIG.browser.cdp_url:
+                # Attach to a warm, already-running Chrome and reuse its session cookies
+                LOGGER.info(f"Connecting to existing browser over CDP: {CONFIG.browser.cdp_url}")
+                self.browser = await self.playwright.chromium.connect_over_cdp(CONFIG.browser.cdp_url)
+                self._owns_browser = False
+                self.context = self.browser.contexts[0] if self.browser.contexts else await self.browser.new_context()
+                self.page = await self.context.new_page()
+            elif CONFIG.browser.profile_dir:
+                # Persistent profile keeps cookies on disk so warm runs can skip login
+                LOGGER.info(f"Launching browser with persistent profile: {CONFIG.browser.profile_dir}")
+                self.context = await self.playwright.chromium.launch_persistent_context(
+                    user_data_dir=CONFIG.browser.profile_dir,
+                    headless=CONFIG.browser.headless,
+                    args=launch_args
+                )
+                self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+            else:
+                self.browser = await self.playwright.chromium.launch(
+                    headless=CONFIG.browser.headless,
+                    args=launch_args
+                )
+                # Restore cookies/localStorage saved by a previous successful login
+                context_kwargs = {}
+                if CONFIG.browser.state_file and Path(CONFIG.browser.state_file).exists():
+                    LOGGER.info(f"Restoring browser session from {CONFIG.browser.state_file}")
+                    context_kwargs['storage_state'] = CONFIG.browser.state_file
+                self.context = await self.browser.new_context(**context_kwargs)
+                self.page = await self.context.new_page()
+            
+            # Applies to pages already open in the context as well as future navigations
+            await self.context.add_init_script(ADP_HELPERS_SCRIPT)
+            # Never intercept requests in a browser we only attached to: the route would apply to the
+            # user's own context and outlive this run
+            if CONFIG.browser.block_resources and not CONFIG.browser.cdp_url:
+                await self.context.route(BLOCKED_ROUTE_PATTERN, self._block_non_essential)
             
             LOGGER.info("Browser setup completed")
-            return BrowserState(is_setup=True)
+            return BrowserState(
+                is_setup=True,
+                headless=CONFIG.browser.headless and not CONFIG.browser.cdp_url,
+                images_disabled=CONFIG.browser.block_resources and not CONFIG.browser.cdp_url
+            )
         except Exception as e:
             LOGGER.error(f"Browser setup failed: {str(e)}")
             return BrowserState(is_setup=False, error_message=str(e))
@@ -156,12 +457,44 @@ class BrowserManager:
             LOGGER.error(f"Navigation failed: {str(e)}")
             return BrowserState(error_message=str(e))
 
+    async def _first_visible(self, selectors: tuple[str, ...], combined_selector: str,
+                             timeout: int) -> Optional[ElementHandle]:
+        """
+        Waits once on the combined ':visible' selector, then resolves the highest-priority match.
+        
+        The union only tells us that something is visible; its first match is in document order,
+        so the selector list is walked in priority order to pick the element. A handle is returned
+        rather than a locator so every later action hits that same element.
+        
+        Returns:
+            Optional[ElementHandle]: The element, or None if nothing became visible within the timeout
+        """
+        try:
+            await self.page.locator(combined_selector).first.wait_for(state="visible", timeout=timeout)
+        except Exception:
+            return None
+        for selector in selectors:
+            handle = await self.page.query_selector(f"{selector}:visible")
+            if handle:
+                return handle
+        return None
+
     async def attempt_login(self, username: str, password: str) -> tuple[LoginStatus, BrowserState]:
+        inner_input = None
         try:
             LOGGER.info("Attempting ADP login")
             
-            # Check if already logged in
-            if await self._is_logged_in():
+            # Check if already logged in: a sign-in URL is a definite no, a session cookie off the
+            # sign-in pages is a definite yes; only ambiguous cases pay for the DOM scan
+            current_url = self.page.url.lower()
+            on_login_url = 'login' in current_url or 'signin' in current_url
+            has_session_cookie = False
+            if not on_login_url:
+                # Only cookies sent to the current site: SMSESSION is generic SiteMinder, and a
+                # persistent or CDP profile can hold one for an unrelated enterprise site
+                cookies = await self.context.cookies(self.page.url)
+                has_session_cookie = any(c['name'] in SESSION_COOKIE_NAMES for c in cookies)
+            if not on_login_url and (has_session_cookie or await self._is_logged_in()):
                 LOGGER.info("Already logged in")
                 return LoginStatus.SUCCESS, BrowserState(
                     is_setup=True,
@@ -170,60 +503,31 @@ class BrowserManager:
                     login_status=LoginStatus.SUCCESS
                 )
             
-            # Wait for page to fully load and take initial screenshot
-            await asyncio.sleep(3)
-            await self.page.screenshot(path="login_page_initial.png")
-            LOGGER.info("Initial screenshot saved: login_page_initial.png")
+            await self._debug_screenshot("login_page_initial")
             
-            # Log all input fields on the page for debugging
-            all_inputs = await self.page.query_selector_all('input')
-            LOGGER.info(f"Found {len(all_inputs)} input fields on the page")
-            for i, input_field in enumerate(all_inputs):
-                try:
-                    tag_name = await input_field.evaluate('el => el.tagName')
-                    input_type = await input_field.get_attribute('type') or 'no-type'
-                    input_name = await input_field.get_attribute('name') or 'no-name'
-                    input_id = await input_field.get_attribute('id') or 'no-id'
-                    placeholder = await input_field.get_attribute('placeholder') or 'no-placeholder'
-                    LOGGER.info(f"Input {i}: {tag_name} type='{input_type}' name='{input_name}' id='{input_id}' placeholder='{placeholder}'")
-                except:
-                    LOGGER.info(f"Input {i}: Could not get attributes")
+            # Log all input fields on the page for debugging (one round-trip for all fields)
+            if CONFIG.debug:
+                all_inputs = await self.page.eval_on_selector_all('input', '''
+                    els => els.map(e => ({
+                        tag: e.tagName,
+                        type: e.getAttribute('type') || '',
+                        name: e.getAttribute('name') || '',
+                        id: e.id || '',
+                        placeholder: e.getAttribute('placeholder') || ''
+                    }))
+                ''')
+                LOGGER.info(f"Found {len(all_inputs)} input fields on the page")
+                for i, info in enumerate(all_inputs):
+                    LOGGER.info(f"Input {i}: {info['tag']} type='{info['type'] or 'no-type'}' name='{info['name'] or 'no-name'}' id='{info['id'] or 'no-id'}' placeholder='{info['placeholder'] or 'no-placeholder'}'")
             
             # Step 1: Find User ID field with ADP-specific selectors (based on actual HTML)
-            user_id_selectors = [
-                'sdf-input#login-form_username',  # Exact match from HTML
-                'sdf-input[id="login-form_username"]',  # Alternative syntax
-                'sdf-input[label="User ID"]',  # Match by label
-                'sdf-input',  # Any sdf-input element
-                '#login-form_username',  # By ID
-                'input[type="text"]',  # Fallback to regular input
-                'input[autocomplete="username"]',  # Match by autocomplete
-                'input',  # Last resort
-            ]
-            
-            user_field = None
-            for i, selector in enumerate(user_id_selectors):
-                try:
-                    LOGGER.info(f"Trying selector {i+1}/{len(user_id_selectors)}: {selector}")
-                    user_field = await self.page.wait_for_selector(selector, timeout=3000)
-                    if user_field:
-                        LOGGER.info(f"Found user field with selector: {selector}")
-                        # Verify this is a visible, editable field
-                        is_visible = await user_field.is_visible()
-                        is_enabled = await user_field.is_enabled()
-                        LOGGER.info(f"Field visible: {is_visible}, enabled: {is_enabled}")
-                        if is_visible and is_enabled:
-                            break
-                        else:
-                            user_field = None
-                except Exception as e:
-                    LOGGER.info(f"Selector {selector} failed: {str(e)}")
-                    continue
+            # One wait over all selectors, then a single handle resolved in priority order so every
+            # later fill/press targets the same element
+            user_field = await self._first_visible(USER_ID_SELECTORS, USER_ID_VISIBLE, timeout=10000)
             
             if not user_field:
                 LOGGER.error("Could not find User ID field after trying all selectors")
-                await self.page.screenshot(path="no_user_field_found.png")
-                LOGGER.info("Screenshot saved: no_user_field_found.png")
+                await self._debug_screenshot("no_user_field_found")
                 return LoginStatus.FAILED, BrowserState(error_message="User ID field not found")
             
             LOGGER.info("Entering User ID")
@@ -237,31 +541,11 @@ class BrowserManager:
                 try:
                     LOGGER.info("Handling ADP sdf-input custom element")
                     
+                    # Resolve the shadow-DOM input once and reuse the handle for every write below
+                    inner_input = await user_field.evaluate_handle("el => el.shadowRoot && el.shadowRoot.querySelector('input')")
+                    
                     # First, check if this element has a shadow root and find the actual input
-                    actual_input = await user_field.evaluate('''
-                        el => {
-                            // Check if there's a shadow root
-                            if (el.shadowRoot) {
-                                const input = el.shadowRoot.querySelector('input');
-                                if (input) {
-                                    console.log('Found input in shadow DOM');
-                                    return 'shadow';
-                                }
-                            }
-                            // Check if there's a direct child input
-                            const input = el.querySelector('input');
-                            if (input) {
-                                console.log('Found direct child input');
-                                return 'child';
-                            }
-                            // Check if this element itself accepts input
-                            if (el.hasAttribute('value') || el.value !== undefined) {
-                                console.log('Element itself accepts input');
-                                return 'direct';
-                            }
-                            return 'unknown';
-                        }
-                    ''')
+                    actual_input = await user_field.evaluate("el => window.__adpHelpers.detectInput(el)")
                     
                     LOGGER.info(f"sdf-input structure: {actual_input}")
                     
@@ -269,366 +553,209 @@ class BrowserManager:
                     await user_field.click()
                     await asyncio.sleep(0.5)
                     
-                    # Method 1: Try to interact with shadow DOM input if it exists
+                    # Shadow DOM inputs are written directly by the validation pass below;
+                    # other structures get one value-set on the child input (or the host itself)
                     if actual_input == 'shadow':
                         LOGGER.info("Entering text via shadow DOM input")
-                        await user_field.evaluate(f'''
-                            el => {{
-                                const input = el.shadowRoot.querySelector('input');
-                                if (input) {{
-                                    input.focus();
-                                    input.value = '';
-                                    input.value = '{username}';
-                                    
-                                    // Trigger events on both the inner input and the custom element
-                                    ['focus', 'input', 'change', 'blur'].forEach(eventType => {{
-                                        input.dispatchEvent(new Event(eventType, {{ bubbles: true }}));
-                                        el.dispatchEvent(new Event(eventType, {{ bubbles: true }}));
-                                    }});
-                                    
-                                    // Trigger keyboard events
-                                    input.dispatchEvent(new KeyboardEvent('keydown', {{ key: 'Tab', bubbles: true }}));
-                                    input.dispatchEvent(new KeyboardEvent('keyup', {{ key: 'Tab', bubbles: true }}));
-                                }}
-                            }}
-                        ''')
-                    
-                    # Method 2: Try typing character by character to trigger real events
                     else:
-                        LOGGER.info("Using character-by-character typing with enhanced events")
-                        # Clear field first
-                        await user_field.evaluate('el => { if (el.value !== undefined) el.value = ""; }')
-                        
-                        # Type each character with events
-                        for char in username:
-                            await user_field.type(char, delay=50)
-                            # Trigger additional validation events after each character
-                            await user_field.evaluate('''
-                                el => {
-                                    el.dispatchEvent(new Event('input', { bubbles: true, cancelable: true }));
-                                    if (el.shadowRoot) {
-                                        const input = el.shadowRoot.querySelector('input');
-                                        if (input) {
-                                            input.dispatchEvent(new Event('input', { bubbles: true, cancelable: true }));
-                                        }
-                                    }
-                                }
-                            ''')
-                            await asyncio.sleep(50)
+                        LOGGER.info("Setting value on sdf-input child/host element")
+                        await user_field.evaluate("(el, value) => window.__adpHelpers.setValue(el, value)", username)
                     
-                    # Final validation trigger - simulate all events that could trigger validation
-                    await user_field.evaluate(f'''
-                        el => {{
-                            // Set the value multiple ways to ensure it sticks
-                            if (el.shadowRoot) {{
-                                const input = el.shadowRoot.querySelector('input');
-                                if (input) {{
-                                    input.value = '{username}';
-                                }}
-                            }}
-                            if (el.value !== undefined) {{
-                                el.value = '{username}';
-                            }}
-                            
-                            // Trigger comprehensive event chain
-                            const events = ['input', 'change', 'blur', 'focusout', 'keyup'];
-                            events.forEach(eventType => {{
-                                el.dispatchEvent(new Event(eventType, {{ bubbles: true, cancelable: true }}));
-                                // Also trigger on shadow DOM input if it exists
-                                if (el.shadowRoot) {{
-                                    const input = el.shadowRoot.querySelector('input');
-                                    if (input) {{
-                                        input.dispatchEvent(new Event(eventType, {{ bubbles: true, cancelable: true }}));
-                                    }}
-                                }}
-                            }});
-                            
-                            // Trigger custom events that ADP might be listening for
-                            el.dispatchEvent(new CustomEvent('validate', {{ bubbles: true, detail: {{ value: '{username}' }} }}));
-                            el.dispatchEvent(new CustomEvent('valueChanged', {{ bubbles: true, detail: {{ value: '{username}' }} }}));
-                        }}
-                    ''')
+                    # Value-set, full event chain and custom events in a single round-trip
+                    await user_field.evaluate(
+                        "(el, { input, value }) => window.__adpHelpers.setAndFireAll(el, input, value, ['input', 'change', 'blur', 'focusout', 'keyup'])",
+                        {'input': inner_input, 'value': username}
+                    )
                     
                     LOGGER.info("Entered username with comprehensive event validation")
                     
                 except Exception as e:
                     LOGGER.error(f"Failed to enter username properly: {str(e)}")
                     # Final fallback: try direct value setting with basic events
-                    await user_field.evaluate(f'''
-                        el => {{
-                            el.value = "{username}";
-                            el.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                            el.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        }}
-                    ''')
+                    await user_field.evaluate('''
+                        (el, value) => {
+                            el.value = value;
+                            el.dispatchEvent(new Event('input', { bubbles: true }));
+                            el.dispatchEvent(new Event('change', { bubbles: true }));
+                        }
+                    ''', username)
             else:
-                # Regular input element
-                await user_field.clear()
+                # Regular input element; fill replaces any existing value
                 await user_field.fill(username)
                 LOGGER.info("Set value using standard fill method")
             
-            # Wait for validation to complete and button to become enabled
-            await asyncio.sleep(3)
+            # Fast path: many ADP forms advance on Enter, which skips the Next button search entirely
+            await user_field.press("Enter")
+            try:
+                await self.page.wait_for_selector('input[type="password"]', timeout=2000)
+                password_step_shown = True
+                LOGGER.info("Password step reached by pressing Enter")
+            except Exception:
+                password_step_shown = False
             
-            # Enhanced check for Next button enabling
-            next_button_enabled = False
-            for attempt in range(5):  # Try 5 times with increasing waits
-                try:
-                    # Look for the Next button with multiple approaches
-                    next_buttons = await self.page.query_selector_all('sdf-button, button')
-                    for button in next_buttons:
-                        try:
-                            button_text = await button.text_content()
-                            if button_text and 'next' in button_text.lower():
-                                is_enabled = await button.is_enabled()
-                                has_disabled_attr = await button.get_attribute('disabled')
-                                aria_disabled = await button.get_attribute('aria-disabled')
-                                
-                                # Check multiple ways the button could be disabled
-                                button_actually_enabled = (
-                                    is_enabled and 
-                                    not has_disabled_attr and 
-                                    aria_disabled != 'true'
-                                )
-                                
-                                LOGGER.info(f"Attempt {attempt+1}: Next button enabled: {is_enabled}, disabled attr: {has_disabled_attr}, aria-disabled: {aria_disabled}, actually enabled: {button_actually_enabled}")
-                                
-                                if button_actually_enabled:
-                                    next_button_enabled = True
-                                    break
-                        except:
-                            continue
+            if not password_step_shown:
+                # Poll for the Next button to become enabled, backing off 0.1s, 0.2s, 0.4s, 0.8s
+                next_button_enabled = False
+                next_locator = self.page.locator('sdf-button, button').filter(has_text=re.compile(r'next', re.I))
+                for attempt in range(5):
+                    try:
+                        # Read the enabled state of every Next button in one round-trip
+                        enabled_states = await next_locator.evaluate_all('''
+                            els => els.map(el => !(el.disabled || el.hasAttribute('disabled') || el.getAttribute('aria-disabled') === 'true'))
+                        ''')
+                        next_button_enabled = any(enabled_states)
+                        LOGGER.info(f"Attempt {attempt+1}: found {len(enabled_states)} Next button(s), enabled: {enabled_states}")
                     
-                    if next_button_enabled:
-                        break
+                        if next_button_enabled:
+                            break
                     
-                    # If button still not enabled, try more aggressive validation triggering
-                    if attempt < 4:
-                        LOGGER.info(f"Button not enabled yet, triggering more events (attempt {attempt+1})")
-                        await user_field.evaluate(f'''
-                            el => {{
-                                // Focus and blur to trigger validation
-                                el.focus();
-                                
-                                // Set value again to ensure it's there
-                                if (el.shadowRoot) {{
-                                    const input = el.shadowRoot.querySelector('input');
-                                    if (input) {{
-                                        input.value = '{username}';
-                                        input.focus();
-                                        input.blur();
-                                    }}
-                                }}
-                                
-                                // Trigger form validation events
-                                const form = el.closest('form');
-                                if (form) {{
-                                    form.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                                }}
-                                
-                                // Trigger tab key to move focus (often triggers validation)
-                                el.dispatchEvent(new KeyboardEvent('keydown', {{ key: 'Tab', keyCode: 9, bubbles: true }}));
-                                el.dispatchEvent(new KeyboardEvent('keyup', {{ key: 'Tab', keyCode: 9, bubbles: true }}));
-                                
-                                // Trigger validation-related custom events
-                                el.dispatchEvent(new CustomEvent('validation', {{ bubbles: true }}));
-                                el.dispatchEvent(new CustomEvent('fieldValidation', {{ bubbles: true }}));
-                            }}
-                        ''')
-                        await asyncio.sleep(2)
+                        # If button still not enabled, try more aggressive validation triggering
+                        if attempt < 4:
+                            LOGGER.info(f"Button not enabled yet, triggering more events (attempt {attempt+1})")
+                            await user_field.evaluate(
+                                "(el, { input, value }) => window.__adpHelpers.revalidate(el, input, value)",
+                                {'input': inner_input, 'value': username}
+                            )
+                            await asyncio.sleep(0.1 * (2 ** attempt))
                 
-                except Exception as e:
-                    LOGGER.error(f"Error checking button status: {str(e)}")
+                    except Exception as e:
+                        LOGGER.error(f"Error checking button status: {str(e)}")
                     
-            LOGGER.info(f"Final Next button enabled status: {next_button_enabled}")
+                LOGGER.info(f"Final Next button enabled status: {next_button_enabled}")
             
-            # Take a screenshot to see current state
-            await self.page.screenshot(path="after_username.png")
-            LOGGER.info("Screenshot taken after entering username: after_username.png")
+                # Take a screenshot to see current state
+                await self._debug_screenshot("after_username")
             
-            # Debug: Log current DOM state and form validation
-            await self._debug_form_state()
+                # Debug: Log current DOM state and form validation
+                await self._debug_form_state()
             
-            # Click Next button (from ADP screenshot - there's a "Next" button visible)
-            LOGGER.info("Looking for Next button...")
-            all_buttons = await self.page.query_selector_all('button')
-            LOGGER.info(f"Found {len(all_buttons)} buttons on the page")
-            for i, button in enumerate(all_buttons):
-                try:
-                    button_text = await button.text_content()
-                    button_type = await button.get_attribute('type') or 'no-type'
-                    button_class = await button.get_attribute('class') or 'no-class'
-                    LOGGER.info(f"Button {i}: text='{button_text}' type='{button_type}' class='{button_class}'")
-                except:
-                    LOGGER.info(f"Button {i}: Could not get attributes")
-            
-            next_selectors = [
-                'sdf-button:has-text("Next")',  # ADP custom button component
-                'sdf-button[type="submit"]',  # ADP submit button
-                'button:text("Next")',  # Exact text match for Playwright
-                'button:has-text("Next")',  # Contains text
-                'input[value="Next"]',
-                'button[type="submit"]',
-                'sdf-button',  # Any ADP button as fallback
-                'button',  # Try any button as fallback
-                '.next-button',
-                '#nextButton'
-            ]
-            
-            next_button = None
-            for i, selector in enumerate(next_selectors):
-                try:
-                    LOGGER.info(f"Trying Next button selector {i+1}/{len(next_selectors)}: {selector}")
-                    buttons = await self.page.query_selector_all(selector)
+                # Click Next button (from ADP screenshot - there's a "Next" button visible)
+                LOGGER.info("Looking for Next button...")
+                if CONFIG.debug:
+                    all_buttons = await self.page.eval_on_selector_all('button', '''
+                        els => els.map(e => ({
+                            text: e.textContent,
+                            type: e.getAttribute('type') || '',
+                            cls: e.getAttribute('class') || ''
+                        }))
+                    ''')
+                    LOGGER.info(f"Found {len(all_buttons)} buttons on the page")
+                    for i, info in enumerate(all_buttons):
+                        LOGGER.info(f"Button {i}: text='{info['text']}' type='{info['type'] or 'no-type'}' class='{info['cls'] or 'no-class'}'")
+            
+                next_button = None
+                next_button_tag = None
+                next_button_text = None
+                next_button_is_enabled = False
+                for i, selector in enumerate(NEXT_BUTTON_SELECTORS):
+                    try:
+                        LOGGER.info(f"Trying Next button selector {i+1}/{len(NEXT_BUTTON_SELECTORS)}: {selector}")
+                        buttons = await self.page.query_selector_all(selector)
                     
-                    for button in buttons:
-                        try:
-                            is_visible = await button.is_visible()
-                            button_text = await button.text_content()
+                        for button in buttons:
+                            try:
+                                is_visible = await button.is_visible()
+                                if not is_visible:
+                                    continue
                             
-                            # Check if this is actually a Next button
-                            if button_text and 'next' in button_text.lower() and is_visible:
-                                # For sdf-button, check multiple ways it could be enabled
-                                button_tag = await button.evaluate('el => el.tagName.toLowerCase()')
-                                
-                                if button_tag == 'sdf-button':
-                                    # Custom ADP button - check enabled status more thoroughly
-                                    is_enabled = await button.evaluate('''
-                                        el => {
-                                            // Check multiple properties that could indicate enabled state
-                                            const disabled = el.disabled || el.hasAttribute('disabled') || el.getAttribute('aria-disabled') === 'true';
-                                            const hasClickHandler = el.onclick || el.addEventListener;
-                                            
-                                            console.log('Button disabled:', disabled);
-                                            console.log('Button has click handler:', !!hasClickHandler);
-                                            
-                                            return !disabled;
-                                        }
-                                    ''')
-                                else:
-                                    # Regular button
-                                    is_enabled = await button.is_enabled()
+                                # Read tag, text and disabled state in one round-trip
+                                info = await button.evaluate('''
+                                    el => ({
+                                        tag: el.tagName.toLowerCase(),
+                                        text: el.textContent,
+                                        disabled: el.disabled || el.hasAttribute('disabled') || el.getAttribute('aria-disabled') === 'true'
+                                    })
+                                ''')
+                                button_tag = info['tag']
+                                button_text = info['text']
+                            
+                                # Check if this is actually a Next button
+                                if button_text and 'next' in button_text.lower():
+                                    if button_tag == 'sdf-button':
+                                        # Custom ADP button - the DOM disabled flags are the source of truth
+                                        is_enabled = not info['disabled']
+                                    else:
+                                        # Regular button
+                                        is_enabled = await button.is_enabled()
                                 
-                                LOGGER.info(f"Found button with selector: {selector}, text: '{button_text}', visible: {is_visible}, enabled: {is_enabled}")
+                                    LOGGER.info(f"Found button with selector: {selector}, text: '{button_text}', visible: {is_visible}, enabled: {is_enabled}")
                                 
-                                if is_enabled:
-                                    next_button = button
-                                    break
-                                else:
-                                    # Even if not enabled, keep this as a fallback
-                                    if not next_button:
+                                    if is_enabled or not next_button:
+                                        # Keep a disabled match as a fallback until an enabled one turns up
                                         next_button = button
-                        except Exception as e:
-                            LOGGER.info(f"Error checking button: {str(e)}")
-                            continue
+                                        next_button_tag = button_tag
+                                        next_button_text = button_text
+                                        next_button_is_enabled = is_enabled
+                                    if is_enabled:
+                                        break
+                            except Exception as e:
+                                LOGGER.info(f"Error checking button: {str(e)}")
+                                continue
                     
-                    if next_button:
-                        # Check if we found an enabled button
-                        is_enabled = await next_button.is_enabled() if await next_button.evaluate('el => el.tagName.toLowerCase()') != 'sdf-button' else await next_button.evaluate('el => !el.disabled && !el.hasAttribute("disabled")')
-                        if is_enabled:
+                        if next_button_is_enabled:
                             break
                         
-                except Exception as e:
-                    LOGGER.info(f"Next button selector {selector} failed: {str(e)}")
-                    continue
+                    except Exception as e:
+                        LOGGER.info(f"Next button selector {selector} failed: {str(e)}")
+                        continue
             
-            if next_button:
-                # Try to click the button even if it appears disabled - sometimes ADP buttons work anyway
-                try:
-                    button_tag = await next_button.evaluate('el => el.tagName.toLowerCase()')
-                    button_text = await next_button.text_content()
+                if next_button:
+                    # Try to click the button even if it appears disabled - sometimes ADP buttons work anyway
+                    try:
+                        LOGGER.info(f"Attempting to click {next_button_tag} button with text: '{next_button_text}'")
                     
-                    LOGGER.info(f"Attempting to click {button_tag} button with text: '{button_text}'")
-                    
-                    if button_tag == 'sdf-button':
-                        # For ADP custom buttons, try multiple click methods
-                        LOGGER.info("Using enhanced click for sdf-button")
+                        if next_button_tag == 'sdf-button':
+                            # For ADP custom buttons, try multiple click methods
+                            LOGGER.info("Using enhanced click for sdf-button")
                         
-                        # Method 1: Try regular click
-                        try:
-                            await next_button.click()
-                            LOGGER.info("Regular click succeeded")
-                        except Exception as e:
-                            LOGGER.info(f"Regular click failed: {str(e)}, trying JavaScript click")
+                            # Method 1: Try regular click
+                            try:
+                                await next_button.click()
+                                LOGGER.info("Regular click succeeded")
+                            except Exception as e:
+                                LOGGER.info(f"Regular click failed: {str(e)}, trying JavaScript click")
                             
-                            # Method 2: JavaScript click
-                            await next_button.evaluate('el => el.click()')
+                                # Method 2: JavaScript click
+                                await next_button.evaluate('el => el.click()')
                             
-                        # Method 3: Dispatch click event
-                        await next_button.evaluate('''
-                            el => {
-                                el.dispatchEvent(new MouseEvent('click', { bubbles: true, cancelable: true }));
-                            }
-                        ''')
-                    else:
-                        # Regular button
-                        await next_button.click()
+                            # Method 3: Dispatch click event
+                            await next_button.evaluate('''
+                                el => {
+                                    el.dispatchEvent(new MouseEvent('click', { bubbles: true, cancelable: true }));
+                                }
+                            ''')
+                        else:
+                            # Regular button
+                            await next_button.click()
                     
-                    LOGGER.info("Successfully clicked Next button")
-                    await self.page.wait_for_load_state("networkidle", timeout=15000)
-                    await asyncio.sleep(5)  # Give more time for the page to transition
+                        LOGGER.info("Successfully clicked Next button")
+                        # Wait for the password step to render rather than for the network to go idle
+                        await self.page.wait_for_selector('input[type="password"]', timeout=15000)
                     
-                except Exception as e:
-                    LOGGER.error(f"Failed to click Next button: {str(e)}")
-                    # Try pressing Enter on the user field as fallback
-                    await user_field.press("Enter")
+                    except Exception as e:
+                        LOGGER.error(f"Failed to click Next button: {str(e)}")
+                        # Try pressing Enter on the user field as fallback
+                        await user_field.press("Enter")
                 
-                # Take screenshot after clicking Next
-                await self.page.screenshot(path="after_next_click.png")
-                LOGGER.info("Screenshot taken after clicking Next: after_next_click.png")
-            else:
-                LOGGER.warning("No Next button found, trying to press Enter on user field")
-                await user_field.press("Enter")
-                await asyncio.sleep(3)
+                    # Take screenshot after clicking Next
+                    await self._debug_screenshot("after_next_click")
+                else:
+                    LOGGER.warning("No Next button found, trying to press Enter on user field")
+                    await user_field.press("Enter")
             
             # Step 2: Enter Password
-            password_selectors = [
-                'input[name="PASSWORD"]',
-                'input[name="password"]',
-                'input[type="password"]',
-                'input[id="PASSWORD"]',
-                'input[id="password"]',
-                '#passwordInput'
-            ]
-            
-            password_field = None
-            for selector in password_selectors:
-                try:
-                    password_field = await self.page.wait_for_selector(selector, timeout=10000)
-                    if password_field:
-                        break
-                except:
-                    continue
+            password_field = await self._first_visible(PASSWORD_SELECTORS, PASSWORD_VISIBLE, timeout=10000)
             
             if not password_field:
                 LOGGER.error("Could not find password field after entering User ID")
-                await self.page.screenshot(path="login_debug.png")
-                LOGGER.info("Screenshot saved as login_debug.png for debugging")
+                await self._debug_screenshot("login_debug")
                 return LoginStatus.FAILED, BrowserState(error_message="Password field not found")
             
             LOGGER.info("Entering password")
             await password_field.fill(password)
-            await asyncio.sleep(1)
             
             # Submit login form
-            submit_selectors = [
-                'button[type="submit"]',
-                'input[type="submit"]',
-                'button:has-text("Sign In")',
-                'button:has-text("Login")',
-                'button:has-text("Submit")',
-                '.submit-button',
-                '#submitButton'
-            ]
-            
-            submit_button = None
-            for selector in submit_selectors:
-                try:
-                    submit_button = await self.page.wait_for_selector(selector, timeout=3000)
-                    if submit_button:
-                        break
-                except:
-                    continue
+            submit_button = await self._first_visible(SUBMIT_SELECTORS, SUBMIT_VISIBLE, timeout=3000)
             
             if submit_button:
                 LOGGER.info("Submitting login form")
@@ -637,24 +764,29 @@ class BrowserManager:
                 LOGGER.info("No submit button found, pressing Enter")
                 await password_field.press("Enter")
             
-            # Wait for login to complete
-            await asyncio.sleep(5)
-            await self.page.wait_for_load_state("networkidle")
+            # Wait for login to complete (leaving the sign-in URL); MFA keeps us there, so a timeout is not fatal
+            try:
+                await self.page.wait_for_url(
+                    lambda url: 'login' not in url.lower() and 'signin' not in url.lower(),
+                    timeout=15000
+                )
+            except Exception as e:
+                LOGGER.info(f"Still on sign-in URL after submit: {str(e)}")
 
             # Handle optional MFA step: send verification email, enter code, and verify
             try:
                 LOGGER.info("Checking for MFA prompt ('Send me an email')")
                 await self.page.wait_for_selector('text="Send me an email"', timeout=10000)
-                await self.page.screenshot(path="mfa_prompt.png")
+                await self._debug_screenshot("mfa_prompt")
                 LOGGER.info("MFA detected: clicking 'Send me an email'")
                 await self.page.click('text="Send me an email"')
                 # Wait for code input field to appear
                 code_field = await self.page.wait_for_selector('input[type="text"]', timeout=60000)
-                await self.page.screenshot(path="mfa_input.png")
+                await self._debug_screenshot("mfa_input")
                 # Prompt user for the MFA code
                 code = await asyncio.to_thread(input, "Enter the MFA code sent to your email: ")
                 await code_field.fill(code)
-                await self.page.screenshot(path="mfa_code_filled.png")
+                await self._debug_screenshot("mfa_code_filled")
                 # Click verify/continue button if present
                 locator = self.page.locator('text="Verify"')
                 if await locator.is_visible():
@@ -691,6 +823,9 @@ class BrowserManager:
             # Verify login success
             if await self._is_logged_in():
                 LOGGER.info("Login successful")
+                if CONFIG.browser.state_file:
+                    await self.context.storage_state(path=CONFIG.browser.state_file)
+                    LOGGER.info(f"Browser session saved to {CONFIG.browser.state_file}")
                 return LoginStatus.SUCCESS, BrowserState(
                     is_setup=True,
                     current_url=self.page.url,
@@ -699,8 +834,7 @@ class BrowserManager:
                 )
             else:
                 LOGGER.error("Login failed - still on login page")
-                await self.page.screenshot(path="login_failed.png")
-                LOGGER.info("Screenshot saved as login_failed.png for debugging")
+                await self._debug_screenshot("login_failed")
                 return LoginStatus.FAILED, BrowserState(
                     is_setup=True,
                     current_url=self.page.url,
@@ -710,32 +844,25 @@ class BrowserManager:
                 
         except Exception as e:
             LOGGER.error(f"Login error: {str(e)}")
-            await self.page.screenshot(path="login_error.png")
+            await self._debug_screenshot("login_error")
             return LoginStatus.FAILED, BrowserState(error_message=str(e))
+        finally:
+            if inner_input:
+                await inner_input.dispose()
 
     async def navigate_to_candidates(self) -> tuple[bool, list]:
         try:
             LOGGER.info("Navigating to candidates page")
             
             # Try common navigation patterns
-            navigation_selectors = [
-                'a[href*="candidate"]',
-                'a[href*="resume"]',
-                'a[href*="talent"]',
-                'a[href*="recruit"]',
-                '.menu-item:has-text("Candidates")',
-                '.nav-link:has-text("Resumes")'
-            ]
-            
-            for selector in navigation_selectors:
+            for selector in NAVIGATION_SELECTORS:
                 try:
                     element = await self.page.wait_for_selector(selector, timeout=5000)
                     if element:
-                        await element.click()
-                        await self.page.wait_for_load_state('networkidle')
+                        await self._click_and_wait_for_new_rows(element)
                         if await self.is_candidates_page():
                             return True, []
-                except:
+                except PlaywrightError:
                     continue
             
             return False, []
@@ -749,46 +876,17 @@ class BrowserManager:
             LOGGER.info("Extracting candidates from current page")
             candidates = []
             
-            # Common selectors for candidate listings
-            candidate_selectors = [
-                '.candidate-item',
-                '.employee-row',
-                '.person-card',
-                'tr[data-candidate-id]',
-                '[data-employee-id]'
-            ]
-            
-            for selector in candidate_selectors:
-                try:
-                    elements = await self.page.query_selector_all(selector)
-                    if elements:
-                        for i, element in enumerate(elements):
-                            try:
-                                # Extract name
-                                name_text = await element.text_content() or f"Candidate_{i+1}"
-                                name = name_text.strip().split('\n')[0][:50]
-                                
-                                # Extract profile link
-                                link_element = await element.query_selector('a')
-                                if link_element:
-                                    href = await link_element.get_attribute('href')
-                                    if href:
-                                        if href.startswith('/'):
-                                            url = f"{self.page.url.split('/')[0]}//{self.page.url.split('/')[2]}{href}"
-                                        else:
-                                            url = href
-                                        
-                                        candidate = CandidateModel(
-                                            id=f"candidate_{len(candidates)+1}",
-                                            name=name,
-                                            url=url
-                                        )
-                                        candidates.append(candidate)
-                            except:
-                                continue
-                        break
-                except:
+            base_url = self.page.url  # Read once; every row's link resolves against the same page
+            # One query over all candidate selectors, with name and link read in-page in the same round-trip
+            rows = await self.page.eval_on_selector_all(CANDIDATE_COMBINED, CANDIDATE_ROWS_SCRIPT)
+            for i, row in enumerate(rows):
+                if not row['href']:
                     continue
+                candidates.append(CandidateModel(
+                    id=f"candidate_{len(candidates)+1}",
+                    name=row['name'] or f"Candidate_{i+1}",
+                    url=urljoin(base_url, row['href'])
+                ))
             
             LOGGER.info(f"Found {len(candidates)} candidates")
             return candidates
@@ -799,22 +897,14 @@ class BrowserManager:
 
     async def navigate_to_next_page(self) -> bool:
         try:
-            next_selectors = [
-                'a:has-text("Next")',
-                'button:has-text("Next")',
-                '.pagination-next',
-                '[aria-label="Next page"]'
-            ]
-            
-            for selector in next_selectors:
-                try:
-                    element = await self.page.wait_for_selector(selector, timeout=2000)
-                    if element and await element.is_enabled():
-                        await element.click()
-                        await self.page.wait_for_load_state('networkidle')
-                        return True
-                except:
-                    continue
+            try:
+                element = await self.page.wait_for_selector(PAGINATION_NEXT_COMBINED, timeout=2000)
+            except PlaywrightTimeoutError:
+                return False
+            
+            if element and await element.is_enabled():
+                await self._click_and_wait_for_new_rows(element)
+                return True
             
             return False
             
@@ -824,10 +914,8 @@ class BrowserManager:
     async def is_candidates_page(self) -> bool:
         try:
             # Check for common indicators of a candidates page
-            indicators = ['candidate', 'resume', 'employee', 'talent']
-            page_content = await self.page.content()
-            return any(indicator in page_content.lower() for indicator in indicators)
-        except:
+            return await self.page.evaluate(FIND_INDICATOR_SCRIPT, CANDIDATE_PAGE_PATTERN)
+        except PlaywrightError:
             return False
 
     async def _is_logged_in(self) -> bool:
@@ -838,56 +926,32 @@ class BrowserManager:
             bool: True if logged in, False if still on login page
         """
         try:
-            current_url = self.page.url
+            # URL and page-content checks for both indicator lists in a single round-trip
+            state = await self.page.evaluate(LOGIN_STATE_SCRIPT, {
+                'login_url': LOGIN_URL_PATTERN,
+                'login_content': LOGIN_CONTENT_PATTERN,
+                'success': SUCCESS_PATTERN
+            })
+            current_url = state['url']
             LOGGER.info(f"Current URL: {current_url}")
             
-            # Check if we're still on login pages (these indicate NOT logged in)
-            login_indicators = [
-                'signin.adp.com',
-                'online.adp.com/signin',
-                '/login',
-                '/signin',
-                'User ID',
-                'Password',
-                'Sign In'
-            ]
-            
             # If URL contains login indicators, we're NOT logged in
-            for indicator in login_indicators[:5]:  # URL checks
-                if indicator in current_url:
-                    LOGGER.info(f"Still on login page (URL contains: {indicator})")
-                    return False
+            if state['login_url']:
+                LOGGER.info(f"Still on login page (URL contains: {state['login_url']})")
+                return False
             
             # Check page content for login indicators
-            page_content = await self.page.content()
-            for indicator in login_indicators[5:]:  # Content checks
-                if indicator in page_content:
-                    LOGGER.info(f"Still on login page (page contains: {indicator})")
-                    return False
-            
-            # Look for positive indicators that we're logged in
-            success_indicators = [
-                'dashboard',
-                'workforce',
-                'home',
-                'employee',
-                'menu',
-                'navigation',
-                'logout',
-                'sign out'
-            ]
-            
-            # Check URL for success indicators
-            for indicator in success_indicators:
-                if indicator.lower() in current_url.lower():
-                    LOGGER.info(f"Login detected (URL contains: {indicator})")
-                    return True
-            
-            # Check page content for success indicators
-            for indicator in success_indicators:
-                if indicator.lower() in page_content.lower():
-                    LOGGER.info(f"Login detected (page contains: {indicator})")
-                    return True
+            if state['login_content']:
+                LOGGER.info(f"Still on login page (page contains: {state['login_content']})")
+                return False
+            
+            # Check URL, then page content, for positive indicators that we're logged in
+            if state['success_url']:
+                LOGGER.info(f"Login detected (URL contains: {state['success_url']})")
+                return True
+            if state['success_content']:
+                LOGGER.info(f"Login detected (page contains: {state['success_content']})")
+                return True
             
             # If we've navigated away from signin domains, probably logged in
             if 'signin' not in current_url and 'login' not in current_url:
@@ -901,12 +965,79 @@ class BrowserManager:
             LOGGER.error(f"Error checking login status: {str(e)}")
             return False
 
+    async def wait_for_page_ready(self, page: Page, selector: str, timeout: int = 5000) -> None:
+        """
+        Waits for the DOM and the element the caller needs rather than for network idle,
+        which adds a 500ms floor per navigation and never settles on pages with trackers.
+        """
+        if self._wait_for_network_idle:
+            await page.wait_for_load_state('networkidle')
+            return
+        await page.wait_for_load_state('domcontentloaded')
+        try:
+            await page.wait_for_selector(selector, timeout=timeout)
+        except PlaywrightTimeoutError:
+            LOGGER.debug("Timed out waiting for %s on %s", selector, page.url)
+
+    async def _click_and_wait_for_new_rows(self, element) -> None:
+        """
+        Clicks and waits until the candidate rows present before the click are replaced, so rows
+        left over from the previous page of a client-side table are not taken as the new ones.
+        """
+        first_row = await self.page.query_selector(CANDIDATE_COMBINED)
+        before = await first_row.inner_text() if first_row else None
+        await element.click()
+        if first_row:
+            try:
+                await self.page.wait_for_function(ROWS_CHANGED_SCRIPT, arg=[first_row, before], timeout=5000)
+            except PlaywrightError:
+                # Timed out with the same rows, or the old document went away with a full navigation
+                LOGGER.debug("Candidate rows did not change in place on %s", self.page.url)
+            try:
+                await first_row.dispose()
+            except PlaywrightError:
+                pass
+        await self.wait_for_page_ready(self.page, CANDIDATE_COMBINED)
+
+    @asynccontextmanager
+    async def lease_page(self):
+        """
+        Leases an idle page from the pool, opening a new one in the shared context if none is free.
+        
+        Only a page whose lease ended cleanly goes back to the pool; one that raised, crashed or
+        was closed, or that would overflow the pool, is closed instead.
+        """
+        page = None
+        while page is None:
+            try:
+                page = self._page_pool.get_nowait()
+            except asyncio.QueueEmpty:
+                page = await self.context.new_page()
+                break
+            if page.is_closed():
+                page = None
+        reusable = False
+        try:
+            yield page
+            reusable = True
+        finally:
+            if reusable and not page.is_closed() and not self._page_pool.full():
+                self._page_pool.put_nowait(page)
+            elif not page.is_closed():
+                try:
+                    await page.close()
+                except PlaywrightError as e:
+                    LOGGER.debug("Closing leased page failed: %s", e)
+
     async def cleanup(self) -> None:
         try:
             LOGGER.info("Cleaning up browser resources")
+            while not self._page_pool.empty():
+                await self._page_pool.get_nowait().close()
             if self.page:
                 await self.page.close()
-            if self.context:
+            # Leave a CDP-attached browser's context alive; closing the browser only disconnects
+            if self.context and self._owns_browser:
                 await self.context.close()
             if self.browser:
                 await self.browser.close()
@@ -25,12 +25,17 @@ class DownloadConfig(BaseModel):
     max_retries: int = 3
 
 class BrowserConfig(BaseModel):
-    headless: bool = False
+    headless: bool = True
     timeout_seconds: int = 30
+    cdp_url: Optional[str] = None  # Attach to an already-running Chrome (e.g. http://localhost:9222)
+    profile_dir: Optional[str] = None  # Persistent user data dir so cookies survive between runs
+    block_resources: bool = True  # Abort images, fonts, media and analytics requests
+    state_file: Optional[str] = None  # storageState JSON saved after login and restored on launch
 
 class ExtractionConfig(BaseModel):
     max_pages: int = 50
     delay_seconds: int = 2
+    wait_for_network_idle: bool = False  # Fall back to networkidle instead of DOM-ready plus a targeted selector
 
 class Config(BaseModel):
     adp: ADPConfig
@@ -39,6 +44,7 @@ class Config(BaseModel):
     extraction: ExtractionConfig
     openai_api_key: str
     openai_model: str = "gpt-4o-mini"
+    debug: bool = False
 
 # Initialize configuration
 CONFIG = Config(
@@ -54,15 +60,21 @@ CONFIG = Config(
         max_retries=int(os.getenv("DOWNLOAD_MAX_RETRIES", "3"))
     ),
     browser=BrowserConfig(
-        headless=os.getenv("BROWSER_HEADLESS", "false").lower() == "true",
-        timeout_seconds=int(os.getenv("BROWSER_TIMEOUT_SECONDS", "30"))
+        headless=os.getenv("BROWSER_HEADLESS", "true").lower() == "true",
+        timeout_seconds=int(os.getenv("BROWSER_TIMEOUT_SECONDS", "30")),
+        cdp_url=os.getenv("BROWSER_CDP_URL") or None,
+        profile_dir=os.getenv("BROWSER_PROFILE_DIR") or None,
+        block_resources=os.getenv("BROWSER_BLOCK_RESOURCES", "true").lower() == "true",
+        state_file=os.getenv("BROWSER_STATE_FILE") or None
     ),
     extraction=ExtractionConfig(
         max_pages=int(os.getenv("EXTRACTION_MAX_PAGES", "50")),
-        delay_seconds=int(os.getenv("EXTRACTION_DELAY_SECONDS", "2"))
+        delay_seconds=int(os.getenv("EXTRACTION_DELAY_SECONDS", "2")),
+        wait_for_network_idle=os.getenv("EXTRACTION_WAIT_NETWORK_IDLE", "false").lower() == "true"
     ),
     openai_api_key=os.getenv("OPENAI_API_KEY", ""),
-    openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+    debug=os.getenv("DEBUG", "false").lower() == "true"
 )
 
 # Setup logging
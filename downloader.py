@@ -4,97 +4,207 @@ Resume downloader with parallel processing
 """
 
 import asyncio
+import json
+import os
+from http import HTTPStatus
+import secrets
 import aiohttp
 import aiofiles
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
-from datetime import datetime
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from urllib.parse import urljoin, urlsplit
 import hashlib
+from functools import lru_cache
 
 from config import CONFIG, LOGGER
-from models import CandidateModel, DownloadStatus
+from models import CandidateModel, DownloadStatus, DownloadAttempt
 from browser import BrowserAutomation
 
-class DownloadAttempt:
-    def __init__(self, candidate_id: str, candidate_name: str, status: DownloadStatus, 
-                 file_path: Optional[Path] = None, error_message: Optional[str] = None):
-        self.candidate_id = candidate_id
-        self.candidate_name = candidate_name
-        self.status = status
-        self.file_path = file_path
-        self.error_message = error_message
-        self.timestamp = datetime.now()
+DOWNLOAD_SELECTORS = (
+    'a[href*="resume"]',
+    'a[href*="cv"]',
+    'a[href*=".pdf"]',
+    'a[href*="download"]',
+    '.resume-download',
+    '.cv-download'
+)
+
+# Queried as one comma-joined selector instead of one wait per selector
+DOWNLOAD_COMBINED = ", ".join(DOWNLOAD_SELECTORS)
+
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+PDF_MAGIC = b'%PDF-'
+MIN_PDF_SIZE = 1024  # Anything smaller is an error page, not a resume
+UNIQUE_FILE_ATTEMPTS = 4  # The plain name plus up to 3 random suffixes
+# Exclusive create; O_BINARY (Windows only) stops the descriptor translating '\n' to '\r\n'
+CREATE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+PART_SUFFIX = '.pdf.part'  # Staging name while a download streams; never mistaken for a finished PDF
+RATE_LIMIT_BACKOFF_SECONDS = 1.0  # Doubled after every 429 response
+RATE_LIMIT_BACKOFF_CEILING = 30.0
+MANIFEST_NAME = '.index.json'  # Maps each candidate's profile URL to its saved resume, across runs
+
+SAFE_FILENAME_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_.")
+_UNSAFE_ASCII_TABLE = str.maketrans("", "", "".join(chr(i) for i in range(128) if chr(i) not in SAFE_FILENAME_CHARS))
 
 class ResumeDownloader:
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._max_retries = 0
+        self._session_lock = asyncio.Lock()
+        self._browser_cookies: List[Dict[str, Any]] = []
+        self._manifest_lock = asyncio.Lock()
+        self._manifest: Dict[str, str] = {}
+        self._manifest_path: Optional[Path] = None
 
-    async def download_all_resumes(
-        self, 
-        candidates: List[CandidateModel], 
-        browser: BrowserAutomation,
+    async def load_manifest(self, download_root: str) -> None:
+        """
+        Loads the index of resumes saved by earlier runs; a missing or unreadable index starts empty.
+        """
+        self._manifest_path = Path(download_root) / MANIFEST_NAME
+        try:
+            async with aiofiles.open(self._manifest_path, 'r', encoding='utf-8') as f:
+                self._manifest = json.loads(await f.read())
+        except (OSError, ValueError):
+            self._manifest = {}
+        LOGGER.info("Loaded %d previously downloaded resumes from %s", len(self._manifest), self._manifest_path)
+
+    async def save_manifest(self) -> None:
+        """
+        Writes the index atomically; called after every successful download as well as at cleanup,
+        so concurrent branches take turns and an interrupted run keeps what it already fetched.
+        """
+        if self._manifest_path is None:
+            return
+        async with self._manifest_lock:
+            self._manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._manifest_path.with_suffix('.tmp')
+            async with aiofiles.open(tmp_path, 'w', encoding='utf-8') as f:
+                await f.write(json.dumps(self._manifest, indent=2))
+            os.replace(tmp_path, self._manifest_path)
+
+    def _manifest_key(self, candidate: CandidateModel) -> str:
+        # Candidate ids are positional per page, so the profile URL is the stable identity
+        return hashlib.sha1(candidate.url.encode('utf-8')).hexdigest()
+
+    async def _ensure_session(self, config: Dict[str, Any], browser: BrowserAutomation) -> aiohttp.ClientSession:
+        """
+        Creates the shared keep-alive session and download semaphore on first use, seeded with the
+        logged-in browser's cookies; later downloads reuse its pooled connections.
+        """
+        async with self._session_lock:
+            if self.session is None or self.session.closed:
+                await self._create_session(config, browser)
+        return self.session
+
+    async def _create_session(self, config: Dict[str, Any], browser: BrowserAutomation) -> None:
+        # Resume links need the ADP session cookies, which only the browser context holds; they are
+        # sent per request as a Cookie header for the download host rather than parsed into a jar
+        self._browser_cookies = await browser.context.cookies()
+
+        max_concurrent = config['download']['max_concurrent']
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._max_retries = config['download']['max_retries']
+        self._connector = aiohttp.TCPConnector(
+            limit=max_concurrent,
+            limit_per_host=max_concurrent,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        self.session = aiohttp.ClientSession(
+            connector=self._connector,
+            timeout=aiohttp.ClientTimeout(total=config['download']['timeout_seconds'])
+        )
+
+    async def close(self) -> None:
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self._connector = None
+        self._semaphore = None
+        self._browser_cookies = []
+
+    def plan_downloads(
+        self,
+        candidates: List[CandidateModel],
         config: Dict[str, Any]
-    ) -> List[DownloadAttempt]:
+    ) -> Tuple[List[Tuple[CandidateModel, Path]], List[CandidateModel]]:
+        """
+        Picks the candidates that still need a resume and resolves each one's target folder.
+        
+        Returns:
+            Tuple: Candidates to download paired with their folder, and the candidates skipped
+            because their resume is already on disk
+        """
         if not candidates:
-            return []
+            return [], []
 
         # Limit to 10 resumes per session
         candidates = candidates[:10]
-        LOGGER.info(f"Starting download process for {len(candidates)} candidates (max 10 per session)")
+        LOGGER.info("Starting download process for %d candidates (max 10 per session)", len(candidates))
 
-        timeout = aiohttp.ClientTimeout(total=config['download']['timeout_seconds'])
-
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            self.session = session
-
-            semaphore = asyncio.Semaphore(config['download']['max_concurrent'])
-            tasks = []
-            for candidate in candidates:
-                req_job = candidate.req_job_title or "Unknown_Req_Job"
-                folder = Path(config['download']['folder']) / req_job
+        # Read the download settings once; workers only receive the resolved folder
+        download_root = Path(config['download']['folder'])
+        folders: Dict[str, Path] = {}
+        pending = []
+        skipped = []
+        for candidate in candidates:
+            known_path = self._manifest.get(self._manifest_key(candidate))
+            if known_path and self._validate_pdf_file(Path(known_path)):
+                LOGGER.info("Resume for %s was downloaded in an earlier run, skipping download.", candidate.name)
+                candidate.mark_processed(DownloadStatus.SUCCESS, Path(known_path))
+                skipped.append(candidate)
+                continue
+            req_job = candidate.req_job_title or "Unknown_Req_Job"
+            folder = folders.get(req_job)
+            if folder is None:
+                folder = folders[req_job] = download_root / req_job
                 folder.mkdir(parents=True, exist_ok=True)
-                safe_name = self._generate_safe_filename(candidate.name)
-                file_path = folder / f"{safe_name}.pdf"
-                if file_path.exists():
-                    LOGGER.info(f"Resume for {candidate.name} already exists in {req_job}, skipping download.")
-                    candidate.mark_processed(DownloadStatus.SUCCESS, file_path)
-                    continue
-                task = self._download_candidate_resume(
-                    candidate, browser, folder, config, semaphore
-                )
-                tasks.append(task)
+            safe_name = self._generate_safe_filename(candidate.name)
+            file_path = folder / f"{safe_name}.pdf"
+            if self._validate_pdf_file(file_path):
+                LOGGER.info("Resume for %s already exists in %s, skipping download.", candidate.name, req_job)
+                candidate.mark_processed(DownloadStatus.SUCCESS, file_path)
+                self._manifest[self._manifest_key(candidate)] = str(file_path)
+                skipped.append(candidate)
+                continue
+            pending.append((candidate, folder))
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        return pending, skipped
 
-            valid_results = []
-            for result in results:
-                if isinstance(result, DownloadAttempt):
-                    valid_results.append(result)
-                elif isinstance(result, Exception):
-                    LOGGER.error(f"Download task failed: {str(result)}")
-
-        successful = sum(1 for r in valid_results if r.status == DownloadStatus.SUCCESS)
-        LOGGER.info(f"Download completed: {successful}/{len(valid_results)} successful")
-
-        return valid_results
+    async def download_resume(
+        self,
+        candidate: CandidateModel,
+        browser: BrowserAutomation,
+        download_dir: Path,
+        config: Dict[str, Any]
+    ) -> DownloadAttempt:
+        """
+        Downloads one candidate's resume; safe to call from many concurrent graph branches.
+        """
+        await self._ensure_session(config, browser)
+        return await self._download_candidate_resume(candidate, browser, download_dir, self._semaphore)
 
     async def _download_candidate_resume(
         self,
         candidate: CandidateModel,
         browser: BrowserAutomation,
         download_dir: Path,
-        config: Dict[str, Any],
         semaphore: asyncio.Semaphore
     ) -> DownloadAttempt:
-        async with semaphore:
-            try:
+        try:
+            # Only the browser stage holds a semaphore slot and a page; once the link is found both
+            # are released, so the next candidate's navigation overlaps this candidate's transfer
+            # (which the connector's per-host limit still bounds)
+            async with semaphore, browser.lease_page() as page:
                 # Navigate to candidate profile
-                await browser.page.goto(candidate.url)
-                await browser.page.wait_for_load_state('networkidle')
-                await asyncio.sleep(1)
+                await page.goto(candidate.url, wait_until='domcontentloaded')
+                await browser.wait_for_page_ready(page, 'tr')
 
                 # Click the clip icon to open the resume window (if available)
-                rows = await browser.page.query_selector_all('tr')
+                rows = await page.query_selector_all('tr')
                 for row in rows:
                     name_el = await row.query_selector('a')
                     name = (await name_el.inner_text()).strip() if name_el else None
@@ -107,111 +217,186 @@ class ResumeDownloader:
                         break
 
                 # Find resume download link
-                download_url = await self._find_resume_download_url(browser, candidate)
-
-                if not download_url:
-                    return DownloadAttempt(
-                        candidate.id, candidate.name, 
-                        DownloadStatus.NOT_FOUND, 
-                        error_message="Resume download URL not found"
-                    )
-
-                # Download the file
-                file_path = await self._download_file(download_url, candidate, download_dir)
-
-                if await self._validate_pdf_file(file_path):
-                    candidate.mark_processed(DownloadStatus.SUCCESS, file_path)
-                    LOGGER.info(f"✓ Downloaded resume for {candidate.name}")
-                    return DownloadAttempt(candidate.id, candidate.name, DownloadStatus.SUCCESS, file_path)
-                else:
-                    return DownloadAttempt(
-                        candidate.id, candidate.name, 
-                        DownloadStatus.FAILED, 
-                        error_message="File validation failed"
-                    )
-
-            except Exception as e:
-                error_message = str(e)
-                candidate.mark_processed(DownloadStatus.FAILED, error=error_message)
-                LOGGER.error(f"✗ Failed to download resume for {candidate.name}: {error_message}")
+                download_url = await self._find_resume_download_url(page, candidate)
+
+            if not download_url:
+                candidate.mark_processed(DownloadStatus.NOT_FOUND, error="Resume download URL not found")
+                return DownloadAttempt(
+                    candidate.id, candidate.name, 
+                    DownloadStatus.NOT_FOUND, 
+                    error_message="Resume download URL not found"
+                )
+
+            # Download the file (validated while streaming)
+            file_path, is_valid_pdf = await self._download_file(download_url, candidate, download_dir)
+
+            if is_valid_pdf:
+                candidate.mark_processed(DownloadStatus.SUCCESS, file_path)
+                self._manifest[self._manifest_key(candidate)] = str(file_path)
+                LOGGER.info("✓ Downloaded resume for %s", candidate.name)
+                return DownloadAttempt(candidate.id, candidate.name, DownloadStatus.SUCCESS, file_path)
+            else:
+                candidate.mark_processed(DownloadStatus.FAILED, error="File validation failed")
                 return DownloadAttempt(
                     candidate.id, candidate.name, 
                     DownloadStatus.FAILED, 
-                    error_message=error_message
+                    error_message="File validation failed"
                 )
 
-    async def _find_resume_download_url(self, browser: BrowserAutomation, candidate: CandidateModel) -> Optional[str]:
+        except Exception as e:
+            error_message = str(e)
+            candidate.mark_processed(DownloadStatus.FAILED, error=error_message)
+            LOGGER.error("✗ Failed to download resume for %s: %s", candidate.name, error_message)
+            return DownloadAttempt(
+                candidate.id, candidate.name, 
+                DownloadStatus.FAILED, 
+                error_message=error_message
+            )
+
+    async def _find_resume_download_url(self, page: Page, candidate: CandidateModel) -> Optional[str]:
         try:
-            download_selectors = [
-                'a[href*="resume"]',
-                'a[href*="cv"]',
-                'a[href*=".pdf"]',
-                'a[href*="download"]',
-                '.resume-download',
-                '.cv-download'
-            ]
+            try:
+                # Attached rather than visible: a hidden first match must not hide a later PDF link
+                await page.locator(DOWNLOAD_COMBINED).first.wait_for(state='attached', timeout=2000)
+            except PlaywrightTimeoutError:
+                return None
             
-            for selector in download_selectors:
-                try:
-                    element = await browser.page.wait_for_selector(selector, timeout=2000)
-                    if element:
-                        href = await element.get_attribute('href')
-                        if href and href.endswith('.pdf'):
-                            if href.startswith('/'):
-                                current_url = browser.page.url
-                                base_url = f"{current_url.split('/')[0]}//{current_url.split('/')[2]}"
-                                href = base_url + href
-                            return href
-                except:
-                    continue
+            # Read every candidate link's href in one query and take the first PDF
+            hrefs = await page.eval_on_selector_all(
+                DOWNLOAD_COMBINED, "els => els.map(el => el.getAttribute('href'))"
+            )
+            for href in hrefs:
+                if href and href.endswith('.pdf'):
+                    return urljoin(page.url, href)
             
             return None
             
         except Exception as e:
-            LOGGER.error(f"Error finding resume URL for {candidate.name}: {str(e)}")
+            LOGGER.error("Error finding resume URL for %s: %s", candidate.name, e)
             return None
 
-    async def _download_file(self, download_url: str, candidate: CandidateModel, download_dir: Path) -> Path:
-        safe_name = self._generate_safe_filename(candidate.name)
-        file_path = download_dir / f"{safe_name}.pdf"
+    async def _download_file(
+        self, download_url: str, candidate: CandidateModel, download_dir: Path
+    ) -> Tuple[Optional[Path], bool]:
+        """
+        Streams the response body to a '.part' file, checking the PDF header and minimum size on the
+        way, and only publishes it under a '.pdf' name once it has passed both checks.
         
-        counter = 1
-        while file_path.exists():
-            file_path = download_dir / f"{safe_name}_{counter}.pdf"
-            counter += 1
+        Returns:
+            Tuple[Optional[Path], bool]: The published file (None if rejected) and whether it is valid
+        """
+        safe_name = self._generate_safe_filename(candidate.name)
         
-        async with self.session.get(download_url) as response:
-            if response.status == 200:
-                content = await response.read()
-                async with aiofiles.open(file_path, 'wb') as f:
-                    await f.write(content)
-                return file_path
-            else:
-                raise Exception(f"HTTP {response.status}")
+        for attempt in range(self._max_retries + 1):
+            async with self.session.get(download_url, headers=self._cookie_headers(download_url)) as response:
+                if response.status == 200:
+                    part_path, fd = self._create_unique_file(download_dir, safe_name, PART_SUFFIX)
+                    header = b''
+                    file_size = 0
+                    try:
+                        async with aiofiles.open(fd, 'wb') as f:
+                            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                                if len(header) < len(PDF_MAGIC):
+                                    header += chunk[:len(PDF_MAGIC) - len(header)]
+                                file_size += len(chunk)
+                                await f.write(chunk)
+                        if header == PDF_MAGIC and file_size >= MIN_PDF_SIZE:
+                            return self._publish_file(part_path, download_dir, safe_name), True
+                        return None, False
+                    finally:
+                        # Only the tool's own staging file is ever removed; published PDFs are untouched
+                        part_path.unlink(missing_ok=True)
+                if response.status != HTTPStatus.TOO_MANY_REQUESTS or attempt == self._max_retries:
+                    raise Exception(f"HTTP {response.status}")
+                delay = self._rate_limit_delay(response, attempt)
+            # Sleep after the response is released so the throttled request holds no connection
+            LOGGER.warning("Rate limited downloading resume for %s, retrying in %.0fs", candidate.name, delay)
+            await asyncio.sleep(delay)
 
-    async def _validate_pdf_file(self, file_path: Path) -> bool:
+    def _cookie_headers(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        Builds a Cookie header from the browser cookies that apply to this URL's host, path and scheme.
+        """
+        parts = urlsplit(url)
+        host = parts.hostname or ''
+        path = parts.path or '/'
+        pairs = []
+        for cookie in self._browser_cookies:
+            domain = cookie['domain']
+            # A leading dot marks a domain cookie; without it the cookie is host-only
+            if domain.startswith('.'):
+                if host != domain[1:] and not host.endswith(domain):
+                    continue
+            elif host != domain:
+                continue
+            if not path.startswith(cookie.get('path') or '/'):
+                continue
+            if cookie.get('secure') and parts.scheme != 'https':
+                continue
+            pairs.append(f"{cookie['name']}={cookie['value']}")
+        return {'Cookie': '; '.join(pairs)} if pairs else None
+
+    def _rate_limit_delay(self, response: aiohttp.ClientResponse, attempt: int) -> float:
+        """
+        Honours a numeric Retry-After header, otherwise backs off exponentially up to the ceiling.
+        """
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), RATE_LIMIT_BACKOFF_CEILING)
+        return min(RATE_LIMIT_BACKOFF_SECONDS * (2 ** attempt), RATE_LIMIT_BACKOFF_CEILING)
+
+    def _validate_pdf_file(self, file_path: Path) -> bool:
+        """
+        Checks size and the PDF header with one small read; no event-loop round-trip needed.
+        """
         try:
-            if not file_path.exists():
-                return False
-            
-            file_size = file_path.stat().st_size
-            if file_size < 1024:  # Less than 1KB
-                return False
-            
-            async with aiofiles.open(file_path, 'rb') as f:
-                header = await f.read(8)
-                return header.startswith(b'%PDF-')
-                
-        except:
+            with open(file_path, 'rb') as f:
+                return os.fstat(f.fileno()).st_size >= MIN_PDF_SIZE and f.read(len(PDF_MAGIC)) == PDF_MAGIC
+        except OSError:
             return False
 
-    def _generate_safe_filename(self, candidate_name: str) -> str:
-        safe_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_."
-        safe_name = ''.join(c for c in candidate_name if c in safe_chars)
-        safe_name = safe_name.replace(' ', '_').strip('_.')[:50]
-        
-        if not safe_name:
-            hash_obj = hashlib.md5(candidate_name.encode())
-            safe_name = f"candidate_{hash_obj.hexdigest()[:8]}"
+    def _create_unique_file(self, download_dir: Path, safe_name: str, suffix: str) -> Tuple[Path, int]:
+        """
+        Atomically creates a new file, adding a random suffix if the name is already taken.
         
-        return safe_name
+        Returns:
+            Tuple[Path, int]: The created file and its open file descriptor
+        """
+        file_path = download_dir / f"{safe_name}{suffix}"
+        for _ in range(UNIQUE_FILE_ATTEMPTS):
+            try:
+                return file_path, os.open(file_path, CREATE_FLAGS, 0o644)
+            except FileExistsError:
+                file_path = download_dir / f"{safe_name}_{secrets.token_hex(3)}{suffix}"
+        raise FileExistsError(f"Could not create a unique file for {safe_name} in {download_dir}")
+
+    def _publish_file(self, part_path: Path, download_dir: Path, safe_name: str) -> Path:
+        """
+        Moves a finished '.part' file onto a free '.pdf' name. The name is reserved first with an
+        exclusive create, so a PDF already there (ours or the user's) is never replaced; a suffix is
+        added instead. Needs no hard-link support, so it also works on FAT/exFAT and SMB shares.
+        """
+        file_path, fd = self._create_unique_file(download_dir, safe_name, '.pdf')
+        os.close(fd)
+        try:
+            os.replace(part_path, file_path)
+        except OSError:
+            file_path.unlink(missing_ok=True)
+            raise
+        return file_path
+
+    def _generate_safe_filename(self, candidate_name: str) -> str:
+        return _safe_filename(candidate_name)
+
+@lru_cache(maxsize=4096)
+def _safe_filename(candidate_name: str) -> str:
+    # Unsafe ASCII is deleted by the translate table, anything non-ASCII by the encode
+    safe_name = candidate_name.translate(_UNSAFE_ASCII_TABLE).encode('ascii', 'ignore').decode('ascii')
+    safe_name = safe_name.replace(' ', '_').strip('_.')[:50]
+    
+    if not safe_name:
+        # 4-byte digest gives the same 8 hex characters without slicing a longer hash
+        hash_obj = hashlib.blake2s(candidate_name.encode('utf-8'), digest_size=4)
+        safe_name = f"candidate_{hash_obj.hexdigest()}"
+    
+    return safe_name
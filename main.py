@@ -9,7 +9,7 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent))
 
-from config import CONFIG, LOGGER
+from config import LOGGER
 from workflow import create_workflow_graph
 from models import create_initial_state
 
@@ -20,7 +20,7 @@ async def main():
         LOGGER.info("=" * 50)
         
         # Create initial state
-        initial_state = create_initial_state(CONFIG.dict())
+        initial_state = create_initial_state()
         initial_state['stats'].start_workflow()
         
         # Create and execute workflow
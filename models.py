@@ -3,8 +3,9 @@
 Data models for ADP Resume Downloader
 """
 
-from typing import List, Dict, Optional, Any, TypedDict
-from pydantic import BaseModel, Field
+from typing import List, Optional, TypedDict, Annotated, FrozenSet, Union
+from dataclasses import dataclass
+from pydantic import BaseModel
 from enum import Enum
 from datetime import datetime
 from pathlib import Path
@@ -33,8 +34,10 @@ class DownloadStatus(Enum):
     NOT_FOUND = "not_found"
     TIMEOUT = "timeout"
 
-class CandidateModel(BaseModel):
-
+# Candidates and stats are built and mutated once per row, so they are plain slotted
+# dataclasses rather than validated pydantic models
+@dataclass(slots=True)
+class CandidateModel:
     id: str
     name: str
     url: str
@@ -51,7 +54,8 @@ class CandidateModel(BaseModel):
         self.download_path = path
         self.error_message = error
 
-class WorkflowStats(BaseModel):
+@dataclass(slots=True)
+class WorkflowStats:
     total_candidates: int = 0
     successful_downloads: int = 0
     failed_downloads: int = 0
@@ -70,23 +74,69 @@ class WorkflowStats(BaseModel):
             return 0.0
         return (self.successful_downloads / self.total_candidates) * 100
 
+@dataclass(slots=True)
+class DownloadAttempt:
+    candidate_id: str
+    candidate_name: str
+    status: DownloadStatus
+    file_path: Optional[Path] = None
+    error_message: Optional[str] = None
+
 class BrowserState(BaseModel):
     is_setup: bool = False
+    headless: bool = False
+    images_disabled: bool = False
     current_url: Optional[str] = None
     is_logged_in: bool = False
     login_status: Optional[LoginStatus] = None
     error_message: Optional[str] = None
 
+def merge_stats(current: WorkflowStats, update: WorkflowStats) -> WorkflowStats:
+    """
+    Reducer for WorkflowGraphState.stats: nodes return only their counts, which are added to the
+    running totals, so parallel download branches never overwrite each other.
+    """
+    return WorkflowStats(
+        total_candidates=current.total_candidates + update.total_candidates,
+        successful_downloads=current.successful_downloads + update.successful_downloads,
+        failed_downloads=current.failed_downloads + update.failed_downloads,
+        start_time=current.start_time or update.start_time,
+        end_time=update.end_time or current.end_time
+    )
+
+@dataclass(slots=True, frozen=True)
+class EvictCandidates:
+    # Profile URLs rather than ids: ids are positional and repeat on every page
+    urls: FrozenSet[str]
+
+def merge_candidates(
+    current: List[CandidateModel],
+    update: Union[List[CandidateModel], EvictCandidates]
+) -> List[CandidateModel]:
+    """
+    Reducer for WorkflowGraphState.candidates: a list appends newly extracted candidates, an
+    EvictCandidates drops the finished ones, so state only carries candidates still pending.
+    """
+    if isinstance(update, EvictCandidates):
+        return [candidate for candidate in current if candidate.url not in update.urls]
+    return current + update
+
+class DownloadTask(TypedDict):
+    candidate: CandidateModel
+    download_dir: Path
+
 class WorkflowGraphState(TypedDict):
     current_state: WorkflowState
     error_message: Optional[str]
     should_continue: bool
     browser_state: BrowserState
-    candidates: List[CandidateModel]
-    stats: WorkflowStats
-    config: Dict[str, Any]
+    # Nodes return deltas; these reducers merge them into the running state
+    candidates: Annotated[List[CandidateModel], merge_candidates]
+    stats: Annotated[WorkflowStats, merge_stats]
+    # Written by plan_downloads_node, read by the dispatch edge that fans out the downloads
+    pending_downloads: List[DownloadTask]
 
-def create_initial_state(config: Dict[str, Any]) -> WorkflowGraphState:
+def create_initial_state() -> WorkflowGraphState:
     return WorkflowGraphState(
         current_state=WorkflowState.INITIALIZED,
         error_message=None,
@@ -94,5 +144,5 @@ def create_initial_state(config: Dict[str, Any]) -> WorkflowGraphState:
         browser_state=BrowserState(),
         candidates=[],
         stats=WorkflowStats(),
-        config=config
+        pending_downloads=[]
     )
@@ -3,77 +3,87 @@
 LangGraph workflow for ADP Resume Downloader
 """
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List, Optional, Set, Union
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
 
 from config import CONFIG, LOGGER
-from models import WorkflowGraphState, WorkflowState, LoginStatus, DownloadStatus
+from models import (
+    WorkflowGraphState, WorkflowState, WorkflowStats, LoginStatus, DownloadStatus, DownloadTask, CandidateModel,
+    EvictCandidates
+)
 from browser import BrowserAutomation
 from downloader import ResumeDownloader
 
 class WorkflowOrchestrator:
-    def __init__(self):
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        # Read-only for the whole run, so it lives here rather than being copied through graph state
+        self.config = config if config is not None else CONFIG.dict()
         self.browser = BrowserAutomation()
         self.downloader = ResumeDownloader()
 
-    async def setup_browser_node(self, state: WorkflowGraphState) -> WorkflowGraphState:
+    async def setup_browser_node(self, state: WorkflowGraphState) -> Dict[str, Any]:
+        update: Dict[str, Any] = {'current_state': WorkflowState.BROWSER_SETUP}
         try:
             LOGGER.info("Setting up browser")
-            state['current_state'] = WorkflowState.BROWSER_SETUP
+            await self.downloader.load_manifest(self.config['download']['folder'])
             
             browser_state = await self.browser.setup_browser()
-            state['browser_state'] = browser_state
+            update['browser_state'] = browser_state
             
             if browser_state.is_setup:
                 LOGGER.info("Browser setup successful")
             else:
-                state['current_state'] = WorkflowState.ERROR
-                state['error_message'] = browser_state.error_message or "Browser setup failed"
-                state['should_continue'] = False
+                update['current_state'] = WorkflowState.ERROR
+                update['error_message'] = browser_state.error_message or "Browser setup failed"
+                update['should_continue'] = False
                 
         except Exception as e:
-            LOGGER.error(f"Browser setup error: {str(e)}")
-            state['current_state'] = WorkflowState.ERROR
-            state['error_message'] = str(e)
-            state['should_continue'] = False
+            LOGGER.error("Browser setup error: %s", e)
+            update['current_state'] = WorkflowState.ERROR
+            update['error_message'] = str(e)
+            update['should_continue'] = False
             
-        return state
+        return update
 
-    async def login_node(self, state: WorkflowGraphState) -> WorkflowGraphState:
+    async def login_node(self, state: WorkflowGraphState) -> Dict[str, Any]:
+        update: Dict[str, Any] = {}
         try:
             LOGGER.info("Attempting login")
             
-            login_url = state['config']['adp']['login_url']
+            login_url = self.config['adp']['login_url']
             browser_state = await self.browser.navigate_to_login(login_url)
-            state['browser_state'] = browser_state
+            update['browser_state'] = browser_state
             
             if not browser_state.current_url:
-                state['current_state'] = WorkflowState.LOGIN_FAILED
-                state['error_message'] = "Failed to navigate to login page"
-                return state
+                update['current_state'] = WorkflowState.LOGIN_FAILED
+                update['error_message'] = "Failed to navigate to login page"
+                return update
             
-            username = state['config']['adp']['username']
-            password = state['config']['adp']['password']
+            username = self.config['adp']['username']
+            password = self.config['adp']['password']
             
             login_status, browser_state = await self.browser.attempt_login(username, password)
-            state['browser_state'] = browser_state
+            update['browser_state'] = browser_state
             
             if login_status == LoginStatus.SUCCESS:
                 LOGGER.info("Login successful")
-                state['current_state'] = WorkflowState.LOGIN_SUCCESS
+                update['current_state'] = WorkflowState.LOGIN_SUCCESS
             else:
-                LOGGER.error(f"Login failed: {login_status.value}")
-                state['current_state'] = WorkflowState.LOGIN_FAILED
-                state['error_message'] = f"Login failed: {login_status.value}"
+                LOGGER.error("Login failed: %s", login_status.value)
+                update['current_state'] = WorkflowState.LOGIN_FAILED
+                update['error_message'] = f"Login failed: {login_status.value}"
                 
         except Exception as e:
-            LOGGER.error(f"Login error: {str(e)}")
-            state['current_state'] = WorkflowState.LOGIN_FAILED
-            state['error_message'] = str(e)
+            LOGGER.error("Login error: %s", e)
+            update['current_state'] = WorkflowState.LOGIN_FAILED
+            update['error_message'] = str(e)
             
-        return state
+        return update
 
-    async def navigate_to_candidates_node(self, state: WorkflowGraphState) -> WorkflowGraphState:
+    async def navigate_to_candidates_node(self, state: WorkflowGraphState) -> Dict[str, Any]:
+        update: Dict[str, Any] = {}
         try:
             LOGGER.info("Navigating to candidates page")
             
@@ -81,107 +91,154 @@ class WorkflowOrchestrator:
             
             if success:
                 LOGGER.info("Navigation successful")
-                state['current_state'] = WorkflowState.NAVIGATION_SUCCESS
+                update['current_state'] = WorkflowState.NAVIGATION_SUCCESS
             else:
                 LOGGER.error("Navigation failed")
-                state['current_state'] = WorkflowState.NAVIGATION_FAILED
-                state['error_message'] = "Failed to navigate to candidates page"
+                update['current_state'] = WorkflowState.NAVIGATION_FAILED
+                update['error_message'] = "Failed to navigate to candidates page"
                 
         except Exception as e:
-            LOGGER.error(f"Navigation error: {str(e)}")
-            state['current_state'] = WorkflowState.NAVIGATION_FAILED
-            state['error_message'] = str(e)
+            LOGGER.error("Navigation error: %s", e)
+            update['current_state'] = WorkflowState.NAVIGATION_FAILED
+            update['error_message'] = str(e)
             
-        return state
+        return update
 
-    async def extract_candidates_node(self, state: WorkflowGraphState) -> WorkflowGraphState:
+    async def extract_candidates_node(self, state: WorkflowGraphState) -> Dict[str, Any]:
+        update: Dict[str, Any] = {}
+        found: List[CandidateModel] = []
+        # Pagination can repeat rows when the list re-sorts; ids are positional, so key on the profile URL
+        seen_urls: Set[str] = set()
         try:
             LOGGER.info("Extracting candidates")
             
-            max_pages = state['config']['extraction']['max_pages']
+            max_pages = self.config['extraction']['max_pages']
             current_page = 1
             
             while current_page <= max_pages:
                 page_candidates = await self.browser.extract_candidates_from_page()
                 
-                if page_candidates:
-                    state['candidates'].extend(page_candidates)
-                    state['stats'].total_candidates += len(page_candidates)
-                    LOGGER.info(f"Found {len(page_candidates)} candidates on page {current_page}")
+                # Checked row by row so a URL repeated within the same page is also dropped
+                new_count = 0
+                for candidate in page_candidates:
+                    if candidate.url in seen_urls:
+                        continue
+                    seen_urls.add(candidate.url)
+                    found.append(candidate)
+                    new_count += 1
                 
-                # Try to go to next page
-                if current_page < max_pages:
-                    has_next = await self.browser.navigate_to_next_page()
-                    if not has_next:
-                        break
+                if new_count:
+                    LOGGER.info("Found %d candidates on page %d", new_count, current_page)
+                
+                # Stop at the page limit or when there is no next page
+                if current_page >= max_pages or not await self.browser.navigate_to_next_page():
+                    break
                 
                 current_page += 1
             
-            LOGGER.info(f"Extraction complete. Total candidates: {len(state['candidates'])}")
-            state['current_state'] = WorkflowState.EXTRACTION_COMPLETE
+            LOGGER.info("Extraction complete. Total candidates: %d", len(found))
+            update['current_state'] = WorkflowState.EXTRACTION_COMPLETE
+            if not found:
+                LOGGER.warning("No candidates found, skipping downloads")
+                update['error_message'] = "No candidates found"
             
         except Exception as e:
-            LOGGER.error(f"Extraction error: {str(e)}")
-            state['current_state'] = WorkflowState.ERROR
-            state['error_message'] = str(e)
+            LOGGER.error("Extraction error: %s", e)
+            update['current_state'] = WorkflowState.ERROR
+            update['error_message'] = str(e)
             
-        return state
+        # One batched delta for the whole walk; the reducers append and add it to the state
+        update['candidates'] = found
+        update['stats'] = WorkflowStats(total_candidates=len(found))
+        return update
 
-    async def download_resumes_node(self, state: WorkflowGraphState) -> WorkflowGraphState:
+    async def plan_downloads_node(self, state: WorkflowGraphState) -> Dict[str, Any]:
+        update: Dict[str, Any] = {}
         try:
-            LOGGER.info("Starting resume downloads")
-            
-            if not state['candidates']:
+            pending, skipped = self.downloader.plan_downloads(state['candidates'], self.config)
+            if not pending:
                 LOGGER.warning("No candidates to download")
-                state['current_state'] = WorkflowState.DOWNLOAD_COMPLETE
-                return state
+            # A resume already on disk counts as a success, so a fully up-to-date re-run completes
+            update['stats'] = WorkflowStats(successful_downloads=len(skipped))
+            update['candidates'] = EvictCandidates(frozenset(c.url for c in skipped))
+            update['pending_downloads'] = [
+                DownloadTask(candidate=candidate, download_dir=folder) for candidate, folder in pending
+            ]
             
-            download_results = await self.downloader.download_all_resumes(
-                candidates=state['candidates'],
+        except Exception as e:
+            LOGGER.error("Download planning error: %s", e)
+            update['current_state'] = WorkflowState.ERROR
+            update['error_message'] = str(e)
+            update['pending_downloads'] = []
+            
+        return update
+
+    def dispatch_downloads(self, state: WorkflowGraphState) -> Union[List[Send], str]:
+        """
+        Fans out one download_one branch per planned download so LangGraph runs them concurrently.
+        """
+        if not state['pending_downloads']:
+            return "cleanup"
+
+        LOGGER.info("Starting resume downloads")
+        return [Send("download_one", task) for task in state['pending_downloads']]
+
+    async def download_one_node(self, task: DownloadTask) -> Dict[str, Any]:
+        candidate = task['candidate']
+        # Evicted from state whatever the outcome; the reducer keys on the URL, not on shared flags
+        finished = EvictCandidates(frozenset({candidate.url}))
+        try:
+            result = await self.downloader.download_resume(
+                candidate=candidate,
                 browser=self.browser,
-                config=state['config']
+                download_dir=task['download_dir'],
+                config=self.config
             )
-            
-            # Update statistics
-            for result in download_results:
-                if result.status == DownloadStatus.SUCCESS:
-                    state['stats'].successful_downloads += 1
-                else:
-                    state['stats'].failed_downloads += 1
-            
-            LOGGER.info(f"Downloads complete: {state['stats'].successful_downloads} successful, "
-                       f"{state['stats'].failed_downloads} failed")
-            
-            state['current_state'] = WorkflowState.DOWNLOAD_COMPLETE
+            if result.status == DownloadStatus.SUCCESS:
+                # Checkpoint each result as it lands rather than only once every download has finished
+                await self.downloader.save_manifest()
+                return {"candidates": finished, "stats": WorkflowStats(successful_downloads=1)}
             
         except Exception as e:
-            LOGGER.error(f"Download error: {str(e)}")
-            state['current_state'] = WorkflowState.ERROR
-            state['error_message'] = str(e)
+            # One failed branch must not abort the fan-out and skip cleanup
+            LOGGER.error("Download error for %s: %s", candidate.name, e)
+            if not candidate.processed:
+                candidate.mark_processed(DownloadStatus.FAILED, error=str(e))
             
-        return state
+        return {"candidates": finished, "stats": WorkflowStats(failed_downloads=1)}
 
-    async def cleanup_node(self, state: WorkflowGraphState) -> WorkflowGraphState:
+    async def cleanup_node(self, state: WorkflowGraphState) -> Dict[str, Any]:
+        update: Dict[str, Any] = {'should_continue': False}
         try:
             LOGGER.info("Cleaning up")
-            await self.browser.cleanup()
+            stats = state['stats']
+            if stats.successful_downloads or stats.failed_downloads:
+                LOGGER.info("Downloads complete: %d successful, %d failed",
+                            stats.successful_downloads, stats.failed_downloads)
             
-            if state['stats'].successful_downloads > 0:
-                state['current_state'] = WorkflowState.COMPLETED
+            if stats.successful_downloads > 0:
+                update['current_state'] = WorkflowState.COMPLETED
             else:
-                state['current_state'] = WorkflowState.ERROR
+                update['current_state'] = WorkflowState.ERROR
                 if not state.get('error_message'):
-                    state['error_message'] = "No resumes downloaded"
-            
-            state['should_continue'] = False
-            
+                    update['error_message'] = "No resumes downloaded"
         except Exception as e:
-            LOGGER.error(f"Cleanup error: {str(e)}")
-            state['current_state'] = WorkflowState.ERROR
-            state['error_message'] = str(e)
-            state['should_continue'] = False
+            LOGGER.error("Cleanup error: %s", e)
+            update['current_state'] = WorkflowState.ERROR
+            update['error_message'] = str(e)
+        
+        # Always awaited, whatever happened above. The manifest write runs alongside the slow
+        # browser shutdown; the HTTP session is only closed once both have finished
+        try:
+            await asyncio.gather(self.browser.cleanup(), self.downloader.save_manifest())
+        except Exception as e:
+            LOGGER.error("Cleanup error: %s", e)
+            update['current_state'] = WorkflowState.ERROR
+            update['error_message'] = str(e)
+        finally:
+            await self.downloader.close()
             
-        return state
+        return update
 
     def should_continue_after_login(self, state: WorkflowGraphState) -> str:
         return "navigate_to_candidates" if state['current_state'] == WorkflowState.LOGIN_SUCCESS else "cleanup"
@@ -190,9 +247,16 @@ class WorkflowOrchestrator:
         return "extract_candidates" if state['current_state'] == WorkflowState.NAVIGATION_SUCCESS else "cleanup"
 
     def should_continue_after_extraction(self, state: WorkflowGraphState) -> str:
-        return "download_resumes" if state['current_state'] == WorkflowState.EXTRACTION_COMPLETE else "cleanup"
+        # Nothing was extracted: go straight to cleanup without touching the downloader
+        if state['current_state'] != WorkflowState.EXTRACTION_COMPLETE or not state['candidates']:
+            return "cleanup"
+        return "plan_downloads"
 
 def create_workflow_graph() -> StateGraph:
+    """
+    Builds and compiles the workflow once per run. Not cached: the orchestrator bound into the
+    graph owns the browser, its page pool, the HTTP session and the manifest, all tied to one run.
+    """
     LOGGER.info("Creating LangGraph workflow")
     
     orchestrator = WorkflowOrchestrator()
@@ -203,7 +267,8 @@ def create_workflow_graph() -> StateGraph:
     workflow.add_node("login", orchestrator.login_node)
     workflow.add_node("navigate_to_candidates", orchestrator.navigate_to_candidates_node)
     workflow.add_node("extract_candidates", orchestrator.extract_candidates_node)
-    workflow.add_node("download_resumes", orchestrator.download_resumes_node)
+    workflow.add_node("plan_downloads", orchestrator.plan_downloads_node)
+    workflow.add_node("download_one", orchestrator.download_one_node)
     workflow.add_node("cleanup", orchestrator.cleanup_node)
     
     # Set entry point
@@ -227,10 +292,16 @@ def create_workflow_graph() -> StateGraph:
     workflow.add_conditional_edges(
         "extract_candidates",
         orchestrator.should_continue_after_extraction,
-        {"download_resumes": "download_resumes", "cleanup": "cleanup"}
+        {"plan_downloads": "plan_downloads", "cleanup": "cleanup"}
+    )
+    
+    workflow.add_conditional_edges(
+        "plan_downloads",
+        orchestrator.dispatch_downloads,
+        ["download_one", "cleanup"]
     )
     
-    workflow.add_edge("download_resumes", "cleanup")
+    workflow.add_edge("download_one", "cleanup")
     workflow.add_edge("cleanup", END)
     
     return workflow.compile()